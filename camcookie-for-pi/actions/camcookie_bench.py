@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# Camcookie Actions - latency benchmark
+# Runs recorded WAV commands through the same STT, matching and action code as
+# camcookie_actions, with pyautogui/pyttsx3/pyaudio swapped for silent stand-ins
+# so it runs headless (no display, speakers or microphone needed). Shell
+# commands run by actions (os.system, e.g. open_chromium) are recorded instead
+# of run, so no browser or other app is launched.
+#
+#   python3 camcookie_bench.py --corpus bench_corpus
+#
+# The corpus folder holds 16-bit mono WAV files and a corpus.json like:
+#
+#   {"commands": [
+#       {"wav": "open_browser.wav", "text": "open browser", "action": "open_browser"},
+#       {"wav": "noise.wav", "text": "", "action": null}
+#   ]}
+#
+# "text" is what was said and "action" is the command name that should match
+# (null when nothing should).
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import math
+import os
+import sys
+import time
+import types
+import wave
+from importlib.machinery import SourceFileLoader
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+CHUNK_FRAMES = 4000  # same read size as the microphone loop
+STAGES = ["stt_feed", "stt_final", "match", "action", "total"]
+PERCENTILES = [50, 90, 99]
+
+# ---------- Stand-in back ends ----------
+
+class StubEngine:
+    def say(self, text):
+        pass
+
+    def runAndWait(self):
+        pass
+
+    def save_to_file(self, text, path):
+        pass
+
+    def getProperty(self, name):
+        return None
+
+def install_stubs():
+    """Register silent pyautogui/pyttsx3/pyaudio modules before the import."""
+    pyautogui = types.ModuleType("pyautogui")
+    pyautogui.calls = []
+
+    def record(name):
+        def call(*args, **kwargs):
+            pyautogui.calls.append((name, args, kwargs))
+        return call
+
+    for name in ("hotkey", "typewrite", "moveTo", "click", "press", "write"):
+        setattr(pyautogui, name, record(name))
+    pyautogui.size = lambda: (1920, 1080)
+
+    pyttsx3 = types.ModuleType("pyttsx3")
+    pyttsx3.init = lambda *args, **kwargs: StubEngine()
+
+    # Audio comes from WAV files, so the microphone is never opened
+    pyaudio = types.ModuleType("pyaudio")
+    pyaudio.paInt16 = 8
+    pyaudio.PyAudio = lambda: None
+
+    sys.modules["pyautogui"] = pyautogui
+    sys.modules["pyttsx3"] = pyttsx3
+    sys.modules["pyaudio"] = pyaudio
+
+def stub_shell(cam):
+    """Record os.system calls made by actions instead of running them."""
+    cam.shell_calls = []
+
+    def system(command):
+        cam.shell_calls.append(command)
+        return 0
+
+    cam.os.system = system
+
+def load_camcookie(path: str):
+    # The repo keeps the script as camcookie_actions.py.txt; on the Pi it's .py
+    loader = SourceFileLoader("camcookie_actions", path)
+    spec = importlib.util.spec_from_loader("camcookie_actions", loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["camcookie_actions"] = module
+    loader.exec_module(module)
+    return module
+
+def find_camcookie():
+    for name in ("camcookie_actions.py", "camcookie_actions.py.txt"):
+        path = os.path.join(BENCH_DIR, name)
+        if os.path.exists(path):
+            return path
+    raise SystemExit("camcookie_actions.py not found next to camcookie_bench.py")
+
+# ---------- Corpus ----------
+
+def load_corpus(corpus_dir: str):
+    with open(os.path.join(corpus_dir, "corpus.json"), "r") as f:
+        data = json.load(f)
+
+    corpus = []
+    for entry in data.get("commands", []):
+        corpus.append({
+            "wav": os.path.join(corpus_dir, entry["wav"]),
+            "text": entry.get("text", "").lower(),
+            "action": entry.get("action"),
+        })
+    return corpus
+
+def read_wav(path: str):
+    with wave.open(path, "rb") as wf:
+        if wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+            raise ValueError(f"{path} must be 16-bit mono PCM")
+        rate = wf.getframerate()
+        chunks = []
+        while True:
+            data = wf.readframes(CHUNK_FRAMES)
+            if not data:
+                break
+            chunks.append(data)
+    return rate, chunks
+
+# ---------- Stats ----------
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    # Nearest rank, so p90 never reads lower than 90% of the samples
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def word_errors(expected: str, heard: str):
+    # Word-level edit distance, for the word error rate
+    ref, hyp = expected.split(), heard.split()
+    row = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        prev, row[0] = row[0], i
+        for j, hyp_word in enumerate(hyp, 1):
+            prev, row[j] = row[j], min(row[j] + 1,
+                                       row[j - 1] + 1,
+                                       prev + (ref_word != hyp_word))
+    return row[-1], len(ref)
+
+# ---------- Benchmark ----------
+
+def run_command(cam, entry, quiet: bool):
+    rate, chunks = read_wav(entry["wav"])
+    timings = {}
+    output = io.StringIO() if quiet else sys.stdout
+
+    with contextlib.redirect_stdout(output):
+        start = time.perf_counter()
+        recognizer = cam.KaldiRecognizer(cam.model, rate)
+        cam.accept_audio(recognizer, chunks)
+        fed = time.perf_counter()
+        text = cam.final_text(recognizer)
+        heard = time.perf_counter()
+        action_def = cam.find_matching_action(text)
+        matched = time.perf_counter()
+
+        status = "no match"
+        if action_def:
+            try:
+                cam.execute_action(action_def)
+                status = "done"
+            except cam.ActionCancelled:
+                status = "cancelled"
+            except Exception as e:
+                status = f"failed: {e}"
+        done = time.perf_counter()
+
+    timings["stt_feed"] = fed - start
+    timings["stt_final"] = heard - fed
+    timings["match"] = matched - heard
+    timings["action"] = done - matched
+    timings["total"] = done - start
+
+    return {
+        "wav": os.path.basename(entry["wav"]),
+        "expected_text": entry["text"],
+        "heard": text,
+        "expected_action": entry["action"],
+        "matched": action_def.name if action_def else None,
+        "status": status,
+        "timings": timings,
+    }
+
+def matcher_throughput(cam, texts, seconds: float) -> float:
+    if not texts:
+        return 0.0
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for text in texts:
+            cam.find_matching_action(text)
+        count += len(texts)
+    return count / (time.perf_counter() - start)
+
+def summarize(results, throughput):
+    summary = {"commands": len(results), "latency_ms": {}}
+    for stage in STAGES:
+        samples = [r["timings"][stage] * 1000 for r in results]
+        stats = {f"p{pct}": percentile(samples, pct) for pct in PERCENTILES}
+        stats["max"] = max(samples, default=0.0)
+        summary["latency_ms"][stage] = stats
+
+    errors = words = 0
+    for r in results:
+        e, n = word_errors(r["expected_text"], r["heard"])
+        errors += e
+        words += n
+
+    total = len(results) or 1
+    summary["transcript_accuracy"] = sum(r["heard"] == r["expected_text"] for r in results) / total
+    summary["word_error_rate"] = errors / words if words else 0.0
+    summary["command_accuracy"] = sum(r["matched"] == r["expected_action"] for r in results) / total
+    summary["matcher_per_second"] = throughput
+    return summary
+
+def print_report(results, summary):
+    print(f"{'wav':<28} {'heard':<30} {'matched':<20} {'total ms':>9}")
+    for r in results:
+        flag = "" if r["matched"] == r["expected_action"] else "  <-- expected " + str(r["expected_action"])
+        print(f"{r['wav']:<28} {r['heard'][:30]:<30} {str(r['matched']):<20} "
+              f"{r['timings']['total'] * 1000:>9.1f}{flag}")
+
+    print()
+    print(f"{'stage':<10}" + "".join(f"{'p' + str(p):>10}" for p in PERCENTILES) + f"{'max':>10}")
+    for stage in STAGES:
+        stats = summary["latency_ms"][stage]
+        print(f"{stage:<10}" + "".join(f"{stats['p' + str(p)]:>10.1f}" for p in PERCENTILES)
+              + f"{stats['max']:>10.1f}")
+
+    print()
+    print(f"Commands:            {summary['commands']}")
+    print(f"Transcript accuracy: {summary['transcript_accuracy']:.1%}")
+    print(f"Word error rate:     {summary['word_error_rate']:.1%}")
+    print(f"Command accuracy:    {summary['command_accuracy']:.1%}")
+    print(f"Matcher throughput:  {summary['matcher_per_second']:,.0f} matches/s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Camcookie Actions latency benchmark")
+    parser.add_argument("--corpus", required=True, help="folder with corpus.json and WAV files")
+    parser.add_argument("--script", help="path to camcookie_actions.py (default: next to this file)")
+    parser.add_argument("--model", help="Vosk model folder (default: the script's VOSK_MODEL_PATH)")
+    parser.add_argument("--actions", help="actions.json (default: the script's ACTIONS_JSON)")
+    parser.add_argument("--skip-waits", action="store_true",
+                        help="don't sleep inside actions (e.g. go_to_url's 2 s browser wait)")
+    parser.add_argument("--throughput-seconds", type=float, default=1.0,
+                        help="how long to hammer find_matching_action")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--max-total-p90-ms", type=float,
+                        help="exit 1 if total p90 latency is above this")
+    parser.add_argument("--min-command-accuracy", type=float,
+                        help="exit 1 if command accuracy (0-1) is below this")
+    parser.add_argument("--verbose", action="store_true", help="show Camcookie's own output")
+    args = parser.parse_args()
+
+    install_stubs()
+    cam = load_camcookie(args.script or find_camcookie())
+    stub_shell(cam)
+
+    try:
+        from vosk import SetLogLevel
+        SetLogLevel(-1)
+    except ImportError:
+        pass
+
+    if args.model:
+        cam.VOSK_MODEL_PATH = args.model
+    if args.actions:
+        cam.ACTIONS_JSON = args.actions
+    if args.skip_waits:
+        cam.wait_or_cancel = lambda seconds: cam.check_cancelled()
+
+    for name, func in (("actions", cam.load_actions_file), ("model", cam.load_model)):
+        start = time.perf_counter()
+        func()
+        print(f"[LOAD] {name}: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    corpus = load_corpus(args.corpus)
+    results = [run_command(cam, entry, quiet=not args.verbose) for entry in corpus]
+    throughput = matcher_throughput(cam, [r["heard"] for r in results] + [e["text"] for e in corpus],
+                                    args.throughput_seconds)
+    summary = summarize(results, throughput)
+    print_report(results, summary)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"summary": summary, "results": results}, f, indent=2)
+
+    failed = False
+    if args.max_total_p90_ms is not None and summary["latency_ms"]["total"]["p90"] > args.max_total_p90_ms:
+        print(f"FAIL: total p90 above {args.max_total_p90_ms} ms")
+        failed = True
+    if args.min_command_accuracy is not None and summary["command_accuracy"] < args.min_command_accuracy:
+        print(f"FAIL: command accuracy below {args.min_command_accuracy:.0%}")
+        failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())